@@ -15,43 +15,118 @@ UDP broadcast mode is also supported for backward compatibility.
 """
 
 import argparse
+import ctypes
+import errno
 import logging
 import json
 import os
+import queue
+import selectors
+import signal
 import socket
+import sys
 import threading
 import time
+from collections import OrderedDict
 from datetime import datetime, timezone
 from waggle.plugin import Plugin
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
 
 # Tempest network configuration
 UDP_PORT = 50222
+UDP_RCVBUF_BYTES = 8 << 20  # Kernel receive buffer to absorb broadcast bursts
+UDP_RECV_BUFSIZE = 65535  # Largest UDP payload, so no datagram is ever truncated
+UDP_BATCH_SIZE = 32  # Datagrams received per recvmmsg() call
 TCP_PORT = 50222
+TCP_LISTEN_BACKLOG = 128  # Absorb hub reconnect bursts without refusing connections
+TCP_RCVBUF_BYTES = 65536  # Receive buffer for accepted client connections
+MAX_TCP_MESSAGE_BYTES = 65535  # Largest accepted length-prefixed message
+TCP_READ_BUFSIZE = 1 << 17  # Per-connection read buffer, holds at least one full frame
 DEFAULT_PROTOCOL = "tcp"  # TCP is now the default protocol
 
 # Global Tempest data storage
-tempest_data_lock = threading.Lock()
-latest_tempest_raw_by_type = {}
+# Data model: the listener event loops are the only writers (one per worker
+# thread, each replacing whole values with single-key operations, which are
+# atomic under the GIL), and every other thread only reads. No lock is needed;
+# readers take a .copy() snapshot before iterating, and len() is atomic.
+# Message types come from the network, so the last-seen map is an LRU capped
+# at MAX_TRACKED_MESSAGE_TYPES; the other maps only hold known parser types.
+MAX_TRACKED_MESSAGE_TYPES = 128
+tempest_last_seen_by_type = OrderedDict()  # time.monotonic_ns() of the latest message of every type
+latest_tempest_raw_by_type = {}  # Latest decoded message for each parsed type
 latest_tempest_parsed_by_type = {}
 
+# JSON decoding: orjson parses bytes directly in native code and is several
+# times faster than the standard library for small Tempest messages.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError.
+if orjson is not None:
+    json_loads = orjson.loads
+    JSONDecodeError = orjson.JSONDecodeError
+else:
+    def json_loads(data):
+        # json.loads() accepts bytes and bytearray but not memoryview
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+    JSONDecodeError = json.JSONDecodeError
+
 # Global plugin instance and publishing control
-last_publish_times = {}  # Track last publish time for each message type
-publish_interval = 60  # Default publish interval in seconds
+# Each gate closes over the publish interval, so the hot path never looks it up
+publish_gates = {}  # Rate-limit gate for each message type, built in main()
+_last_error = None  # Latest publish error, reported by the next heartbeat
+HEARTBEAT_JOIN_TIMEOUT = 5  # Seconds to wait for the heartbeat thread at shutdown
+
+
+def make_publish_gate(interval):
+    """
+    Build a rate limiter allowing one publish per interval seconds.
+    
+    The next allowed time lives in the closure as integer nanoseconds, so
+    checking a gate is a single call and one integer compare.
+    
+    Args:
+        interval: Minimum number of seconds between publishes
+    
+    Returns:
+        callable: should_publish(now_ns, consume=True) -> bool, taking
+                  time.monotonic_ns(); when the gate is open and consume is
+                  true a new interval is started, while consume=False only
+                  checks the gate without using it up
+    """
+    interval_ns = int(interval * 1_000_000_000)
+    next_allowed_ns = [0]
+    
+    def should_publish(now_ns, consume=True):
+        if now_ns < next_allowed_ns[0]:
+            return False
+        if consume:
+            next_allowed_ns[0] = now_ns + interval_ns
+        return True
+    
+    return should_publish
 
 
 # ---------------- Unit Conversion Functions ----------------
+MPS_TO_KT = 1.943844
+HPA_TO_INHG = 0.0295299830714
+MM_PER_INCH = 25.4
+
 def c_to_f(c): 
     return None if c is None else (c * 9/5) + 32
 
 def mps_to_kt(m): 
-    return None if m is None else m * 1.943844
+    return None if m is None else m * MPS_TO_KT
 
 def hpa_to_inhg(h): 
-    return None if h is None else h * 0.0295299830714
+    return None if h is None else h * HPA_TO_INHG
 
 def mm_to_in(mm): 
-    return None if mm is None else mm / 25.4
+    return None if mm is None else mm / MM_PER_INCH
 
 
 def get_nanosecond_timestamp(tempest_timestamp=None):
@@ -65,14 +140,13 @@ def get_nanosecond_timestamp(tempest_timestamp=None):
     Returns:
         int: Nanoseconds since epoch
     """
-    if tempest_timestamp is not None:
-        # Tempest timestamps are in seconds since epoch
-        timestamp_ns = int(tempest_timestamp * 1_000_000_000)
-    else:
-        # Use current time
-        timestamp_ns = int(time.time() * 1_000_000_000)
+    if tempest_timestamp is None:
+        # Use current time (integer nanoseconds, no float rounding)
+        return time.time_ns()
     
-    return timestamp_ns
+    # Tempest timestamps are in seconds since epoch; keep the whole seconds
+    # in integer arithmetic so large epochs don't lose precision
+    return int(tempest_timestamp) * 1_000_000_000 + int((tempest_timestamp % 1) * 1_000_000_000)
 
 
 # ---------------- Tempest Message Parsers ----------------
@@ -83,85 +157,79 @@ PRECIP_TYPES = {
     3: "snow",
 }
 
-def parse_obs_st(msg):
-    """Parse Tempest device observation messages"""
+def parse_obs_st(msg, received_at):
+    """
+    Parse Tempest device observation messages into a flat dict.
+    
+    received_at is the integer epoch second the message arrived, supplied by
+    the listener. The m/s wind speeds and imperial conversions are not
+    returned, since none of them are published.
+    """
     obs = msg.get("obs", [[]])[0] if msg.get("obs") else []
     if not obs:
         return {"type": "obs_st", "error": "empty obs"}
 
+    # Unpack the fixed obs_st layout in one step; firmware may append
+    # optional fields (local day rain first) after the 18 required ones
+    (timestamp, lull, avg, gust, direction_deg, sample_interval_s,
+     hpa, temp_c, humidity, illuminance, uv, solar_radiation,
+     rain_mm, precip_type, strike_distance_km, strike_count,
+     battery_v, report_interval_min, *optional) = obs
+    local_day_mm = optional[0] if optional else None
+
+    # Unit conversions are inlined rather than calling the helpers above,
+    # since this runs for every observation
     return {
-        "timestamp": obs[0],
-        "wind": {
-            "lull_mps": obs[1], "lull_kt": mps_to_kt(obs[1]),
-            "avg_mps": obs[2],  "avg_kt": mps_to_kt(obs[2]),
-            "gust_mps": obs[3], "gust_kt": mps_to_kt(obs[3]),
-            "direction_deg": obs[4],
-            "sample_interval_s": obs[5],
-        },
-        "pressure": {
-            "hpa": obs[6],
-            "inHg": hpa_to_inhg(obs[6]),
-        },
-        "temperature": {
-            "c": obs[7],
-            "f": c_to_f(obs[7]),
-        },
-        "humidity_percent": obs[8],
-        "light": {
-            "illuminance_lux": obs[9],
-            "uv_index": obs[10],
-            "solar_radiation_wm2": obs[11],
-        },
-        "rain": {
-            "since_report_mm": obs[12],
-            "since_report_in": mm_to_in(obs[12]),
-            "precipitation_type": PRECIP_TYPES.get(obs[13], "unknown"),
-            "local_day_mm": obs[18] if len(obs) > 18 else None,
-            "local_day_in": mm_to_in(obs[18]) if len(obs) > 18 else None,
-        },
-        "lightning": {
-            "avg_distance_km": obs[14],
-            "strike_count": obs[15],
-        },
-        "battery_v": obs[16],
-        "report_interval_min": obs[17],
-        "meta": {
-            "device_sn": msg.get("serial_number"),
-            "hub_sn": msg.get("hub_sn"),
-            "received_at": int(time.time()),
-        },
+        "timestamp": timestamp,
+        "wind.lull_kt": None if lull is None else lull * MPS_TO_KT,
+        "wind.avg_kt": None if avg is None else avg * MPS_TO_KT,
+        "wind.gust_kt": None if gust is None else gust * MPS_TO_KT,
+        "wind.direction_deg": direction_deg,
+        "wind.sample_interval_s": sample_interval_s,
+        "pressure.hpa": hpa,
+        "temperature.c": temp_c,
+        "humidity_percent": humidity,
+        "light.illuminance_lux": illuminance,
+        "light.uv_index": uv,
+        "light.solar_radiation_wm2": solar_radiation,
+        "rain.since_report_mm": rain_mm,
+        "rain.precipitation_type": PRECIP_TYPES.get(precip_type, "unknown"),
+        "rain.local_day_mm": local_day_mm,
+        "lightning.avg_distance_km": strike_distance_km,
+        "lightning.strike_count": strike_count,
+        "battery_v": battery_v,
+        "report_interval_min": report_interval_min,
+        "meta.device_sn": msg.get("serial_number"),
+        "meta.hub_sn": msg.get("hub_sn"),
+        "meta.received_at": received_at,
     }
 
-def parse_rapid_wind(msg):
-    """Parse rapid wind messages for instant wind readings"""
+def parse_rapid_wind(msg, received_at):
+    """Parse rapid wind messages for instant wind readings into a flat dict"""
     ob = msg.get("ob", [])
     if len(ob) < 3:
         return {"type": "rapid_wind", "error": "bad ob"}
+    # Sent every few seconds, so convert inline like parse_obs_st
+    speed = ob[1]
     return {
         "timestamp": ob[0],
-        "wind": {
-            "instant_mps": ob[1],
-            "instant_kt": mps_to_kt(ob[1]),
-            "direction_deg": ob[2],
-        },
-        "meta": {
-            "device_sn": msg.get("serial_number"),
-            "hub_sn": msg.get("hub_sn"),
-            "received_at": int(time.time()),
-        },
+        "wind.instant_mps": speed,
+        "wind.instant_kt": None if speed is None else speed * MPS_TO_KT,
+        "wind.direction_deg": ob[2],
+        "meta.device_sn": msg.get("serial_number"),
+        "meta.hub_sn": msg.get("hub_sn"),
+        "meta.received_at": received_at,
     }
 
-def parse_hub_status(msg):
-    """Parse hub status messages"""
+def parse_hub_status(msg, received_at):
+    """Parse hub status messages into a flat dict"""
     return {
         "firmware": msg.get("firmware_revision"),
         "uptime_s": msg.get("uptime"),
         "rssi": msg.get("rssi"),
         "timestamp": msg.get("time"),
-        "meta": {
-            "hub_sn": msg.get("serial_number"),
-            "received_at": int(time.time()),
-        },
+        "meta.hub_sn": msg.get("serial_number"),
+        "meta.received_at": received_at,
     }
 
 # Message type parsers
@@ -172,214 +240,770 @@ TEMPEST_PARSERS = {
 }
 
 
+def peek_message_type(data, start=0, end=None):
+    """
+    Extract the "type" value from a raw Tempest JSON message without decoding it.
+    
+    Tempest messages are flat JSON objects with a single string "type" field,
+    so locating it in the raw bytes lets the listeners drop unknown and
+    throttled messages before paying for a full JSON decode. A "type" key
+    preceded by a nested object may not be the top-level one, so the peek
+    gives up in that case.
+    
+    Args:
+        data: bytes or bytearray holding the raw message
+        start: Offset of the message within data
+        end: Optional end offset of the message within data
+    
+    Returns:
+        str: The message type, or None if it could not be located (callers
+             should fall back to a full decode)
+    """
+    if end is None:
+        end = len(data)
+    key = data.find(b'"type"', start, end)
+    if key < 0:
+        return None
+    if data.count(b"{", start, key) > 1:
+        return None  # Possibly inside a nested object; needs a real decoder
+    colon = data.find(b":", key + 6, end)
+    if colon < 0 or data[key + 6:colon].strip():
+        return None
+    start = data.find(b'"', colon + 1, end)
+    if start < 0 or data[colon + 1:start].strip():
+        return None
+    stop = data.find(b'"', start + 1, end)
+    if stop < 0:
+        return None
+    value = data[start + 1:stop]
+    if b"\\" in value:
+        return None  # Escaped characters need a real JSON decoder
+    return value.decode("utf-8", "replace")
+
+
+def record_last_seen(msg_type, now):
+    """Record when msg_type was last received, evicting the least recently seen type"""
+    seen = tempest_last_seen_by_type
+    try:
+        seen[msg_type] = now
+        seen.move_to_end(msg_type)
+        if len(seen) > MAX_TRACKED_MESSAGE_TYPES:
+            seen.popitem(last=False)
+    except KeyError:
+        pass  # Another listener thread evicted the same entry first
+
+
+def screen_message_type(msg_type, now, logger):
+    """
+    Record that a message type was received and decide whether to parse it.
+    
+    The publish gate is only checked here, not used up, so a message that
+    later fails to decode or parse does not throttle the next valid one;
+    see consume_publish_gate().
+    
+    Returns:
+        function: The parser for msg_type, or None if the type is unknown
+                  or its publish gate is closed
+    """
+    record_last_seen(msg_type, now)
+    
+    # Nearly every message has a known type, so try/except is the cheap path
+    try:
+        parser = TEMPEST_PARSERS[msg_type]
+    except KeyError:
+        logger.debug("Received unknown message type: %s", msg_type)
+        return None
+    
+    # Skip parsing entirely while this message type is throttled
+    try:
+        gate_open = publish_gates[msg_type](now, consume=False)
+    except KeyError:
+        gate_open = True  # No gate configured for this type
+    if not gate_open:
+        logger.debug("Skipping %s message - publish interval not yet elapsed", msg_type)
+        return None
+    
+    return parser
+
+
+def consume_publish_gate(msg_type, now, logger):
+    """
+    Use up the publish gate for msg_type once its message has been accepted.
+    
+    Returns:
+        bool: False if another listener thread used the gate first since
+              screen_message_type() checked it
+    """
+    try:
+        gate = publish_gates[msg_type]
+    except KeyError:
+        return True  # No gate configured for this type
+    if not gate(now):
+        logger.debug("Skipping %s message - publish interval not yet elapsed", msg_type)
+        return False
+    return True
+
+
 # ---------------- Data Publishing Functions ----------------
-# Publishing logic is now inside main() function within the Plugin context manager
+# Publishing logic is now inside main() function within the Plugin context manager.
+#
+# Each publish spec entry is (name, key, scope, fallback, meta): the value is
+# read from the flat parsed message with a single lookup of key, replaced by
+# fallback when falsy (if a fallback is given), and published with the static
+# meta dict. The meta dicts are built once at import time and shared by every
+# publish call, so they must never be mutated.
+TEMPEST_SENSOR = "tempest-weather-station"
+
+OBS_ST_PUBLISH_SPEC = (
+    # Wind data
+    ("tempest.wind.speed.lull", "wind.lull_kt", "all", None,
+     {"sensor": TEMPEST_SENSOR, "units": "knots",
+      "description": "Tempest wind lull speed", "source": "obs_st", "missing": "-9999.0"}),
+    ("tempest.wind.speed.avg", "wind.avg_kt", "all", None,
+     {"sensor": TEMPEST_SENSOR, "units": "knots",
+      "description": "Tempest average wind speed", "source": "obs_st", "missing": "-9999.0"}),
+    ("tempest.wind.speed.gust", "wind.gust_kt", "all", None,
+     {"sensor": TEMPEST_SENSOR, "units": "knots",
+      "description": "Tempest wind gust speed", "source": "obs_st", "missing": "-9999.0"}),
+    ("tempest.wind.direction", "wind.direction_deg", "all", None,
+     {"sensor": TEMPEST_SENSOR, "units": "degrees",
+      "description": "Tempest wind direction", "source": "obs_st", "missing": "-9999.0"}),
+    # Environmental data
+    ("tempest.pressure", "pressure.hpa", "all", None,
+     {"sensor": TEMPEST_SENSOR, "units": "hPa",
+      "description": "Tempest barometric pressure", "source": "obs_st", "missing": "-9999.0"}),
+    ("tempest.temperature", "temperature.c", "all", None,
+     {"sensor": TEMPEST_SENSOR, "units": "celsius",
+      "description": "Tempest air temperature", "source": "obs_st", "missing": "-9999.0"}),
+    ("tempest.humidity", "humidity_percent", "all", None,
+     {"sensor": TEMPEST_SENSOR, "units": "percent",
+      "description": "Tempest relative humidity", "source": "obs_st", "missing": "-9999.0"}),
+    # Light data
+    ("tempest.light.illuminance", "light.illuminance_lux", "all", None,
+     {"sensor": TEMPEST_SENSOR, "units": "lux",
+      "description": "Tempest illuminance", "source": "obs_st", "missing": "-9999.0"}),
+    ("tempest.light.uv_index", "light.uv_index", "all", None,
+     {"sensor": TEMPEST_SENSOR, "units": "index",
+      "description": "Tempest UV index", "source": "obs_st", "missing": "-9999.0"}),
+    ("tempest.light.solar_radiation", "light.solar_radiation_wm2", "all", None,
+     {"sensor": TEMPEST_SENSOR, "units": "W/m²",
+      "description": "Tempest solar radiation", "source": "obs_st", "missing": "-9999.0"}),
+    # Precipitation data
+    ("tempest.rain.since_report", "rain.since_report_mm", "all", None,
+     {"sensor": TEMPEST_SENSOR, "units": "mm",
+      "description": "Tempest rain since report", "source": "obs_st", "missing": "-9999.0"}),
+    ("tempest.rain.daily", "rain.local_day_mm", "all", 0,
+     {"sensor": TEMPEST_SENSOR, "units": "mm",
+      "description": "Tempest daily rainfall", "source": "obs_st", "missing": "-9999.0"}),
+    # Lightning data
+    ("tempest.lightning.distance", "lightning.avg_distance_km", "node", None,
+     {"sensor": TEMPEST_SENSOR, "units": "km",
+      "description": "Tempest lightning distance", "source": "obs_st", "missing": "-9999.0"}),
+    ("tempest.lightning.count", "lightning.strike_count", "all", None,
+     {"sensor": TEMPEST_SENSOR, "units": "count",
+      "description": "Tempest lightning strike count", "source": "obs_st", "missing": "-9999.0"}),
+    # Battery and system data
+    ("tempest.battery", "battery_v", "all", None,
+     {"sensor": TEMPEST_SENSOR, "units": "volts",
+      "description": "Tempest battery voltage", "source": "obs_st", "missing": "-9999.0"}),
+    ("tempest.report_interval", "report_interval_min", "all", None,
+     {"sensor": TEMPEST_SENSOR, "units": "minutes",
+      "description": "Tempest report interval", "source": "obs_st", "missing": "-9999.0"}),
+)
+
+RAPID_WIND_PUBLISH_SPEC = (
+    ("tempest.wind.speed.instant", "wind.instant_kt", "node", None,
+     {"sensor": TEMPEST_SENSOR, "units": "knots",
+      "description": "Tempest instant wind speed", "source": "rapid_wind", "missing": "-9999.0"}),
+    ("tempest.wind.direction.instant", "wind.direction_deg", "node", None,
+     {"sensor": TEMPEST_SENSOR, "units": "degrees",
+      "description": "Tempest instant wind direction", "source": "rapid_wind", "missing": "-9999.0"}),
+)
+
+HUB_STATUS_PUBLISH_SPEC = (
+    ("tempest.hub.firmware", "firmware", "node", "unknown",
+     {"sensor": TEMPEST_SENSOR, "description": "Tempest hub firmware version",
+      "source": "hub_status", "missing": "unknown"}),
+    ("tempest.hub.uptime", "uptime_s", "node", 0,
+     {"sensor": TEMPEST_SENSOR, "units": "seconds",
+      "description": "Tempest hub uptime", "source": "hub_status", "missing": "-9999.0"}),
+    ("tempest.hub.rssi", "rssi", "all", 0,
+     {"sensor": TEMPEST_SENSOR, "units": "dBm",
+      "description": "Tempest hub signal strength", "source": "hub_status", "missing": "-9999.0"}),
+)
+
+# Plugin status (heartbeat) metadata; per-publish fields are merged into a copy
+STATUS_META = {"sensor": TEMPEST_SENSOR,
+               "description": "Tempest plugin status (1=active, 0=error)", "missing": "-9999.0"}
+STATUS_SHUTDOWN_META = {**STATUS_META, "state": "shutdown"}
+
+
+def make_change_filter(resync_intervals):
+    """
+    Build a filter that suppresses republishing unchanged values.
+    
+    A value equal to the last one published under the same name is skipped,
+    except that it is published anyway after resync_intervals consecutive
+    skips so late subscribers still see every metric periodically.
+    
+    Args:
+        resync_intervals: Number of unchanged publishes to skip before resending
+    
+    Returns:
+        callable: should_publish_value(name, value, record=False) -> bool;
+                  call it with record=True once the value has actually been
+                  published, so a failed publish is not treated as sent
+    """
+    last = {}  # name -> [last published value, consecutive skips]
+    
+    def should_publish_value(name, value, record=False):
+        if record:
+            last[name] = [value, 0]
+            return True
+        entry = last.get(name)
+        if entry is not None and entry[0] == value and entry[1] < resync_intervals:
+            entry[1] += 1
+            return False
+        return True
+    
+    return should_publish_value
+
+
+def publish_spec_values(plugin, spec, parsed_data, timestamp, value_filter=None):
+    """Publish the values in a publish spec table, skipping unchanged ones when filtered; returns the number published"""
+    published = 0
+    for name, key, scope, fallback, meta in spec:
+        value = parsed_data[key]
+        if fallback is not None:
+            value = value or fallback
+        if value_filter is not None and not value_filter(name, value):
+            continue
+        plugin.publish(name, value, timestamp=timestamp, scope=scope, meta=meta)
+        if value_filter is not None:
+            value_filter(name, value, record=True)
+        published += 1
+    return published
+
+
+# ---------------- Publisher Thread ----------------
+# Bound on messages waiting to be published. Publish gates admit only a few
+# messages per interval, so the queue only fills if publishing stalls.
+PUBLISH_QUEUE_SIZE = 64
+
+def make_publish_enqueue(publish_queue, logger):
+    """
+    Create the publish_callback handed to the listeners.
+    
+    The callback queues the parsed message for the publisher thread and
+    returns immediately, so a slow plugin.publish() never delays draining
+    the sockets. When the queue is full the oldest message is dropped,
+    since only the latest reading of each type matters.
+    
+    Args:
+        publish_queue: Bounded queue.Queue read by tempest_publisher()
+        logger: Logger instance
+    
+    Returns:
+        function: enqueue(parsed_data, msg_type)
+    """
+    def enqueue(parsed_data, msg_type):
+        item = (parsed_data, msg_type)
+        while True:
+            try:
+                publish_queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    dropped = publish_queue.get_nowait()
+                    logger.warning(f"⚠️  Publish queue full, dropped queued {dropped[1]} message")
+                except queue.Empty:
+                    pass
+    
+    return enqueue
+
+
+def tempest_publisher(publish_queue, publish_callback, logger):
+    """Publisher thread: publish queued messages in arrival order"""
+    while True:
+        parsed_data, msg_type = publish_queue.get()
+        try:
+            publish_callback(parsed_data, msg_type)
+        except Exception as e:
+            # Keep publishing later messages
+            logger.error(f"Tempest publisher error: {e}")
+
+
+def tempest_heartbeat(plugin, interval, logger, shutdown, listener_thread):
+    """
+    Heartbeat thread: publish tempest.status once per interval until shutdown is set.
+    
+    Publishes 1 while the listener thread is alive and publishing succeeds,
+    or 0 with the error text if the listener has exited or a publish failed
+    since the previous heartbeat.
+    """
+    global _last_error
+    while not shutdown.wait(interval):
+        error, _last_error = _last_error, None
+        if not listener_thread.is_alive():
+            error = "Tempest listener is not running"
+        status_timestamp = get_nanosecond_timestamp()
+        try:
+            if error is None:
+                plugin.publish("tempest.status", 1, 
+                             timestamp=status_timestamp, scope="node",
+                             meta={**STATUS_META, "last_update": str(status_timestamp // 1_000_000_000)})
+            else:
+                plugin.publish("tempest.status", 0, 
+                             timestamp=status_timestamp, scope="node",
+                             meta={**STATUS_META, "error": error})
+        except Exception as e:
+            logger.error(f"Error publishing Tempest heartbeat: {e}")
+
+
+# ---------------- Message Ingestion ----------------
+def ingest_tempest_message(buf, start, end, addr, protocol, logger, publish_callback, received_at):
+    """
+    Decode, parse, store and publish one raw Tempest message.
+    
+    Shared by the UDP and TCP listeners. Invalid JSON raises JSONDecodeError
+    so each listener can report it in its own way; parser errors are logged
+    here and the message is skipped.
+    
+    Args:
+        buf: bytearray holding the raw JSON message at buf[start:end]
+        start: Offset of the message in buf
+        end: End offset of the message in buf
+        addr: Sender address, for logging
+        protocol: "UDP" or "TCP", for logging
+        logger: Logger instance
+        publish_callback: Called as publish_callback(parsed_data, msg_type)
+        received_at: Integer epoch seconds when the message was received,
+                     read once per receive batch by the listener
+    """
+    now = time.monotonic_ns()
+    
+    # Identify the message type from the raw bytes when possible,
+    # falling back to a full decode
+    msg = None
+    msg_type = peek_message_type(buf, start, end)
+    if msg_type is None:
+        msg = json_loads(memoryview(buf)[start:end])
+        msg_type = msg.get("type", "unknown")
+    
+    # %-style arguments are only formatted when debug logging is enabled
+    logger.debug("📥 Received %s %s message from %s (%d bytes)", msg_type, protocol, addr[0], end - start)
+    
+    # Unknown and throttled messages are never fully decoded
+    parser = screen_message_type(msg_type, now, logger)
+    if parser is None:
+        return
+    if msg is None:
+        msg = json_loads(memoryview(buf)[start:end])
+        # The peek takes the first "type" key, which may belong to a nested
+        # object; screen again with the real top-level type if they differ
+        real_type = msg.get("type", "unknown") if isinstance(msg, dict) else "unknown"
+        if real_type != msg_type:
+            msg_type = real_type
+            parser = screen_message_type(msg_type, now, logger)
+            if parser is None:
+                return
+    
+    latest_tempest_raw_by_type[msg_type] = msg
+    
+    try:
+        parsed_data = parser(msg, received_at)
+    except Exception as e:
+        logger.error(f"Error parsing {msg_type} message: {e}")
+        return  # Skip parsing errors but continue listening
+    
+    # Only a successfully decoded and parsed message uses up the publish gate
+    if not consume_publish_gate(msg_type, now, logger):
+        return
+    
+    latest_tempest_parsed_by_type[msg_type] = {
+        "type": msg_type,
+        "data": parsed_data
+    }
+    
+    # Publish the data (already throttled by consume_publish_gate)
+    publish_callback(parsed_data, msg_type)
+
+
+# ---------------- Event Loop ----------------
+def run_tempest_event_loop(logger, publish_callback, udp_sock=None, tcp_server_sock=None):
+    """
+    Serve Tempest sockets from a single thread using selectors (epoll on Linux).
+    
+    The UDP socket, the TCP listening socket and every accepted TCP client are
+    multiplexed on one selector, so receiving data needs no per-connection
+    threads or cross-thread handoff.
+    
+    Args:
+        logger: Logger instance
+        publish_callback: Called as publish_callback(parsed_data, msg_type)
+        udp_sock: Optional bound UDP socket
+        tcp_server_sock: Optional listening TCP socket
+    """
+    sel = selectors.DefaultSelector()
+    if udp_sock is not None:
+        udp_sock.setblocking(False)
+        # Receive datagrams into buffers preallocated once per socket
+        sel.register(udp_sock, selectors.EVENT_READ, ("udp", make_udp_receiver(udp_sock)))
+    if tcp_server_sock is not None:
+        tcp_server_sock.setblocking(False)
+        sel.register(tcp_server_sock, selectors.EVENT_READ, ("accept", None))
+    
+    while True:
+        for key, _ in sel.select():
+            kind, state = key.data
+            try:
+                if kind == "tcp":
+                    if not read_tcp_client(state, logger, publish_callback):
+                        close_tcp_client(state, sel, logger)
+                elif kind == "udp":
+                    read_udp_datagrams(key.fileobj, state, logger, publish_callback)
+                else:
+                    accept_tcp_client(key.fileobj, sel, logger)
+            except Exception as e:
+                # Log errors but keep serving the remaining sockets
+                logger.error(f"Tempest {kind} handler error: {e}")
 
 
 # ---------------- UDP Listener ----------------
-def tempest_udp_listener(logger, publish_callback, udp_port=UDP_PORT):
-    """UDP listener thread for Tempest broadcasts"""
+def tempest_udp_listener(logger, publish_callback, udp_port=UDP_PORT, num_workers=1, start_workers=True):
+    """UDP listener thread for Tempest broadcasts
+    
+    With num_workers > 1, additional listener threads are started, each binding
+    its own SO_REUSEPORT socket to the same port so the kernel spreads unicast
+    datagrams across them by source address. Broadcast datagrams are delivered
+    to every socket, so extra workers only help with unicast forwarding.
+    A single worker does not set SO_REUSEPORT, so a second copy of the plugin
+    on the same port fails to bind.
+    """
+    if start_workers:
+        for _ in range(num_workers - 1):
+            threading.Thread(
+                target=tempest_udp_listener,
+                args=(logger, publish_callback, udp_port, num_workers, False),
+                daemon=True
+            ).start()
+    
     try:
         sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if num_workers > 1 and hasattr(socket, "SO_REUSEPORT"):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UDP_RCVBUF_BYTES)
         sock.bind(("0.0.0.0", udp_port))
         
-        logger.info(f"🌐 Tempest UDP listener started on port {udp_port}")
+        # The kernel silently caps the request at net.core.rmem_max
+        granted = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        logger.info(f"🌐 Tempest UDP listener started on port {udp_port} "
+                    f"(receive buffer {granted} bytes, requested {UDP_RCVBUF_BYTES})")
         
-        while True:
-            try:
-                data, addr = sock.recvfrom(65535)
-                msg = json.loads(data.decode("utf-8"))
-                
-                msg_type = msg.get("type", "unknown")
-                
-                logger.debug(f"📥 Received {msg_type} message from {addr[0]}")
+        run_tempest_event_loop(logger, publish_callback, udp_sock=sock)
                 
-                # Store the raw message by type
-                with tempest_data_lock:
-                    latest_tempest_raw_by_type[msg_type] = msg
-                    
-                    # If we have a parser for this type, also store parsed
-                    parser = TEMPEST_PARSERS.get(msg_type)
-                    if parser:
-                        try:
-                            parsed_data = parser(msg)
-                            latest_tempest_parsed_by_type[msg_type] = {
-                                "type": msg_type,
-                                "data": parsed_data
-                            }
-                            
-                            # Attempt to publish the data (will be throttled based on publish_interval)
-                            publish_callback(parsed_data, msg_type)
-                            
-                        except Exception as e:
-                            logger.error(f"Error parsing {msg_type} message: {e}")
-                            # Skip parsing errors but continue listening
-                    else:
-                        # If no parser, remove any stale parsed entry
-                        if msg_type in latest_tempest_parsed_by_type:
-                            del latest_tempest_parsed_by_type[msg_type]
-                        logger.debug(f"Received unknown message type: {msg_type}")
-                            
-            except json.JSONDecodeError:
+    except Exception as e:
+        logger.error(f"Failed to start Tempest UDP listener: {e}")
+        # Error will be handled by main function
+
+
+def read_udp_datagrams(sock, receiver, logger, publish_callback):
+    """Ingest every datagram queued on the non-blocking UDP socket"""
+    ingest = ingest_tempest_message
+    
+    while True:
+        batch = receiver.receive()
+        received_at = int(time.time())  # Shared by every datagram in the batch
+        
+        for buf, nbytes, addr in batch:
+            try:
+                ingest(buf, 0, nbytes, addr, "UDP", logger, publish_callback, received_at)
+            except JSONDecodeError:
                 # Skip non-JSON packets
                 continue
             except Exception as e:
                 # Log UDP errors but continue listening
                 logger.error(f"UDP listener error: {e}")
                 continue
-                
-    except Exception as e:
-        logger.error(f"Failed to start Tempest UDP listener: {e}")
-        # Error will be handled by main function
+        
+        if len(batch) < receiver.batch_size:
+            return  # Socket drained
+
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IOVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+_SOCKADDR_STORAGE_BYTES = 128
+
+_recvmmsg = None  # Not Linux; use recvfrom_into instead
+if sys.platform.startswith("linux"):
+    # The structures above follow the Linux layout; BSDs export recvmmsg too, with different ones
+    try:
+        _recvmmsg = ctypes.CDLL(None, use_errno=True).recvmmsg
+        _recvmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint,
+                              ctypes.c_int, ctypes.c_void_p]
+        _recvmmsg.restype = ctypes.c_int
+    except (OSError, AttributeError, TypeError):
+        _recvmmsg = None  # libc without recvmmsg; use recvfrom_into instead
+
+
+class UdpReceiver:
+    """Receive one datagram per call with recvfrom_into into a reused buffer"""
+    
+    batch_size = 1
+    
+    def __init__(self, sock, bufsize=UDP_RECV_BUFSIZE):
+        self.sock = sock
+        self.buf = bytearray(bufsize)
+    
+    def receive(self):
+        """Return a tuple of (buf, nbytes, addr); empty once the socket is drained"""
+        try:
+            nbytes, addr = self.sock.recvfrom_into(self.buf)
+        except BlockingIOError:
+            return ()
+        return ((self.buf, nbytes, addr),)
+
+
+class RecvmmsgReceiver:
+    """
+    Receive up to batch_size datagrams per recvmmsg(2) call (Linux only).
+    
+    The datagram buffers, iovecs and source address storage are allocated
+    once and reused for every call, so receiving allocates nothing per packet.
+    """
+    
+    def __init__(self, sock, batch_size=UDP_BATCH_SIZE, bufsize=UDP_RECV_BUFSIZE):
+        self.fd = sock.fileno()
+        self.batch_size = batch_size
+        self.bufs = [bytearray(bufsize) for _ in range(batch_size)]
+        self.names = bytearray(_SOCKADDR_STORAGE_BYTES * batch_size)
+        self.used = batch_size
+        
+        # ctypes views pin the bytearrays so their addresses stay valid
+        self._views = [(ctypes.c_char * bufsize).from_buffer(buf) for buf in self.bufs]
+        names = (ctypes.c_char * len(self.names)).from_buffer(self.names)
+        self._views.append(names)
+        self._iovecs = (_IOVec * batch_size)()
+        self._msgs = (_MMsgHdr * batch_size)()
+        
+        for i in range(batch_size):
+            self._iovecs[i].iov_base = ctypes.addressof(self._views[i])
+            self._iovecs[i].iov_len = bufsize
+            hdr = self._msgs[i].msg_hdr
+            hdr.msg_name = ctypes.addressof(names) + i * _SOCKADDR_STORAGE_BYTES
+            hdr.msg_iov = ctypes.pointer(self._iovecs[i])
+            hdr.msg_iovlen = 1
+    
+    def receive(self):
+        """Return a list of (buf, nbytes, addr); empty once the socket is drained"""
+        msgs = self._msgs
+        # The kernel overwrites msg_namelen for each slot it fills
+        for i in range(self.used):
+            msgs[i].msg_hdr.msg_namelen = _SOCKADDR_STORAGE_BYTES
+        
+        count = _recvmmsg(self.fd, msgs, self.batch_size, 0, None)
+        if count < 0:
+            err = ctypes.get_errno()
+            self.used = 0
+            if err in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                return ()
+            raise OSError(err, os.strerror(err))
+        
+        self.used = count
+        bufs = self.bufs
+        return [(bufs[i], msgs[i].msg_len, self.source_address(i)) for i in range(count)]
+    
+    def source_address(self, i):
+        """Decode the sockaddr the kernel stored for slot i into (host, port)"""
+        off = i * _SOCKADDR_STORAGE_BYTES
+        sa = self.names
+        family = int.from_bytes(sa[off:off + 2], sys.byteorder)
+        port = int.from_bytes(sa[off + 2:off + 4], "big")
+        if family == socket.AF_INET:
+            return (socket.inet_ntop(socket.AF_INET, sa[off + 4:off + 8]), port)
+        if family == socket.AF_INET6:
+            return (socket.inet_ntop(socket.AF_INET6, sa[off + 8:off + 24]), port)
+        return ("unknown", port)
+
+
+def make_udp_receiver(sock):
+    """Use batched recvmmsg() on Linux where libc provides it, otherwise recvfrom_into()"""
+    if _recvmmsg is not None:
+        return RecvmmsgReceiver(sock)
+    return UdpReceiver(sock)
 
 
 # ---------------- TCP Listener ----------------
-def tempest_tcp_listener(logger, publish_callback, tcp_port=TCP_PORT):
-    """TCP listener thread for Tempest length-prefixed messages"""
+def tempest_tcp_listener(logger, publish_callback, tcp_port=TCP_PORT, num_workers=1, start_workers=True):
+    """TCP listener thread for Tempest length-prefixed messages
+    
+    With num_workers > 1, additional listener threads are started, each binding
+    its own SO_REUSEPORT socket to the same port so the kernel load-balances
+    new connections across them. Each thread serves its accepted connections
+    from its own event loop. A single worker does not set SO_REUSEPORT, so a
+    second copy of the plugin on the same port fails to bind.
+    """
+    if start_workers:
+        for _ in range(num_workers - 1):
+            threading.Thread(
+                target=tempest_tcp_listener,
+                args=(logger, publish_callback, tcp_port, num_workers, False),
+                daemon=True
+            ).start()
+    
     try:
         server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if num_workers > 1 and hasattr(socket, "SO_REUSEPORT"):
+            server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        # Set on the listening socket so accepted connections inherit it before
+        # the TCP window is negotiated
+        server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, TCP_RCVBUF_BYTES)
         server_sock.bind(("0.0.0.0", tcp_port))
-        server_sock.listen(5)
+        server_sock.listen(TCP_LISTEN_BACKLOG)
         
         logger.info(f"🌐 Tempest TCP listener started on port {tcp_port}")
         logger.info("📡 Waiting for TCP connections with length-prefixed JSON messages...")
         
-        while True:
-            try:
-                # Accept incoming connections
-                client_sock, addr = server_sock.accept()
-                logger.info(f"📡 Accepted TCP connection from {addr[0]}:{addr[1]}")
-                
-                # Configure client socket for persistent connection
-                client_sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
-                client_sock.settimeout(None)  # No blocking timeout for recv
-                
-                # Start a new thread to handle this client
-                client_thread = threading.Thread(
-                    target=handle_tcp_client,
-                    args=(client_sock, addr, logger, publish_callback),
-                    daemon=True
-                )
-                client_thread.start()
-                
-            except Exception as e:
-                logger.error(f"TCP listener error: {e}")
-                continue
+        run_tempest_event_loop(logger, publish_callback, tcp_server_sock=server_sock)
                 
     except Exception as e:
         logger.error(f"Failed to start Tempest TCP listener: {e}")
         # Error will be handled by main function
 
 
-def handle_tcp_client(client_sock, addr, logger, publish_callback):
-    """Handle messages from a TCP client connection - maintains persistent connection"""
-    logger.info(f"🔗 Starting persistent TCP connection handler for {addr[0]}:{addr[1]}")
+class TcpConnection:
+    """
+    Framing state for one accepted TCP client.
+    
+    Each recv pulls whatever the kernel has queued into a persistent read
+    buffer, and every complete length-prefixed frame is processed from it, so
+    a burst of messages costs a single syscall. Unprocessed bytes live in
+    buf[head:tail].
+    """
+    
+    __slots__ = ("sock", "addr", "buf", "view", "head", "tail")
     
+    def __init__(self, sock, addr):
+        self.sock = sock
+        self.addr = addr
+        self.buf = bytearray(TCP_READ_BUFSIZE)
+        self.view = memoryview(self.buf)
+        self.head = 0
+        self.tail = 0
+
+
+def accept_tcp_client(server_sock, sel, logger):
+    """Accept a pending TCP connection and register it with the event loop"""
     try:
-        while True:
-            try:
-                # Read length prefix (4 bytes, big-endian)
-                length_data = recv_exactly(client_sock, 4, logger, addr)
-                if not length_data:
-                    logger.info(f"📡 Connection closed by {addr[0]}:{addr[1]}")
-                    break
-                    
-                # Unpack length
-                msg_length = int.from_bytes(length_data, byteorder='big')
-                
-                if msg_length <= 0 or msg_length > 65535:  # Reasonable limits
-                    logger.warning(f"Invalid message length: {msg_length} from {addr[0]} - skipping message")
-                    continue  # Skip this message but keep connection alive
-                
-                # Read the actual message
-                msg_data = recv_exactly(client_sock, msg_length, logger, addr)
-                if not msg_data:
-                    logger.info(f"📡 Connection closed by {addr[0]}:{addr[1]} while reading message")
-                    break
-                    
-                try:
-                    # Parse JSON message
-                    msg = json.loads(msg_data.decode("utf-8"))
-                    msg_type = msg.get("type", "unknown")
-                    
-                    logger.debug(f"📥 Received {msg_type} TCP message from {addr[0]} ({msg_length} bytes)")
-                    
-                    # Store the raw message by type
-                    with tempest_data_lock:
-                        latest_tempest_raw_by_type[msg_type] = msg
-                        
-                        # If we have a parser for this type, also store parsed
-                        parser = TEMPEST_PARSERS.get(msg_type)
-                        if parser:
-                            try:
-                                parsed_data = parser(msg)
-                                latest_tempest_parsed_by_type[msg_type] = {
-                                    "type": msg_type,
-                                    "data": parsed_data
-                                }
-                                
-                                # Attempt to publish the data (will be throttled based on publish_interval)
-                                publish_callback(parsed_data, msg_type)
-                                
-                            except Exception as e:
-                                logger.error(f"Error parsing {msg_type} message: {e}")
-                                # Skip parsing errors but continue listening
-                        else:
-                            # If no parser, remove any stale parsed entry
-                            if msg_type in latest_tempest_parsed_by_type:
-                                del latest_tempest_parsed_by_type[msg_type]
-                            logger.debug(f"Received unknown message type: {msg_type}")
-                            
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Invalid JSON from {addr[0]}: {e} - skipping message")
-                    continue  # Skip this message but keep connection alive
-                except Exception as e:
-                    logger.error(f"Error processing TCP message from {addr[0]}: {e} - skipping message")
-                    continue  # Skip this message but keep connection alive
-                    
-            except socket.error as e:
-                logger.info(f"📡 TCP connection to {addr[0]}:{addr[1]} lost: {e}")
-                break
-            except Exception as e:
-                logger.error(f"Unexpected error in TCP client handler for {addr[0]}: {e}")
-                continue  # Try to recover and continue
-                
-    except Exception as e:
-        logger.info(f"📡 TCP client {addr[0]}:{addr[1]} disconnected: {e}")
-    finally:
-        try:
-            client_sock.close()
-            logger.info(f"📡 Closed TCP connection to {addr[0]}:{addr[1]}")
-        except:
-            pass
+        client_sock, addr = server_sock.accept()
+    except BlockingIOError:
+        return  # Nothing pending
+    logger.info(f"📡 Accepted TCP connection from {addr[0]}:{addr[1]}")
+    
+    # Configure client socket for persistent connection
+    client_sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    client_sock.setblocking(False)
+    
+    # Small length-prefixed messages: disable Nagle and delayed ACKs
+    client_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    try:
+        client_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+    except (AttributeError, OSError):
+        pass  # TCP_QUICKACK is Linux-only
+    
+    sel.register(client_sock, selectors.EVENT_READ, ("tcp", TcpConnection(client_sock, addr)))
+    logger.info(f"🔗 Started persistent TCP connection handler for {addr[0]}:{addr[1]}")
 
 
-def recv_exactly(sock, num_bytes, logger, addr=None):
-    """Receive exactly num_bytes from socket with better error handling"""
-    data = b""
-    addr_str = f" from {addr[0]}" if addr else ""
+def read_tcp_client(conn, logger, publish_callback):
+    """
+    Read available data from a TCP client and ingest every complete message.
     
-    while len(data) < num_bytes:
+    Returns:
+        bool: False once the connection has been closed by the peer or lost
+    """
+    addr = conn.addr
+    try:
+        nbytes = conn.sock.recv_into(conn.view[conn.tail:])
+    except BlockingIOError:
+        return True  # Spurious wakeup, nothing to read yet
+    except socket.error as e:
+        logger.info(f"📡 TCP connection to {addr[0]}:{addr[1]} lost: {e}")
+        return False
+    if not nbytes:
+        logger.info(f"📡 Connection closed by {addr[0]}:{addr[1]}")
+        return False
+    
+    buf, view = conn.buf, conn.view
+    head, tail = conn.head, conn.tail + nbytes
+    ingest = ingest_tempest_message
+    received_at = int(time.time())  # Shared by every frame from this read
+    
+    # Process every complete frame (4-byte big-endian length + JSON)
+    while tail - head >= 4:
+        msg_length = int.from_bytes(view[head:head + 4], byteorder='big')
+        
+        if msg_length <= 0 or msg_length > MAX_TCP_MESSAGE_BYTES:  # Reasonable limits
+            logger.warning(f"Invalid message length: {msg_length} from {addr[0]} - skipping message")
+            head += 4
+            continue  # Skip this message but keep connection alive
+        
+        if tail - head < 4 + msg_length:
+            break  # Wait for the rest of the message
+        
+        msg_start = head + 4
+        head = msg_end = msg_start + msg_length
+        
         try:
-            chunk = sock.recv(num_bytes - len(data))
-            if not chunk:
-                logger.debug(f"Connection closed{addr_str} while receiving {num_bytes} bytes")
-                return None  # Connection closed
-            data += chunk
-        except socket.timeout:
-            logger.warning(f"TCP receive timeout{addr_str}")
-            # Don't immediately return None on timeout - this could cause connection drops
-            # Let the socket timeout be handled by the caller
-            return None
-        except (ConnectionResetError, ConnectionAbortedError, BrokenPipeError) as e:
-            logger.info(f"TCP connection reset{addr_str}: {e}")
-            return None
+            ingest(buf, msg_start, msg_end, addr, "TCP", logger, publish_callback, received_at)
+        except JSONDecodeError as e:
+            logger.warning(f"Invalid JSON from {addr[0]}: {e} - skipping message")
+            continue  # Skip this message but keep connection alive
         except Exception as e:
-            logger.error(f"TCP receive error{addr_str}: {e}")
-            return None
-    return data
+            logger.error(f"Error processing TCP message from {addr[0]}: {e} - skipping message")
+            continue  # Skip this message but keep connection alive
+    
+    # Move any partial frame to the front of the buffer
+    if head:
+        remaining = tail - head
+        if remaining:
+            view[:remaining] = view[head:tail]
+        head, tail = 0, remaining
+    
+    conn.head, conn.tail = head, tail
+    return True
+
+
+def close_tcp_client(conn, sel, logger):
+    """Unregister and close a TCP client connection"""
+    addr = conn.addr
+    try:
+        sel.unregister(conn.sock)
+        conn.view.release()
+        conn.sock.close()
+        logger.info(f"📡 Closed TCP connection to {addr[0]}:{addr[1]}")
+    except Exception:
+        pass
 
 
 # ---------------- Command Line Arguments ----------------
@@ -394,15 +1018,20 @@ def parse_args():
     # Get defaults from environment variables or use hardcoded defaults
     default_protocol = os.getenv("TEMPEST_PROTOCOL", DEFAULT_PROTOCOL).lower()
     default_tcp_port = int(os.getenv("TEMPEST_TCP_PORT", TCP_PORT))
+    default_tcp_workers = int(os.getenv("TEMPEST_TCP_WORKERS", "1"))
     default_udp_port = int(os.getenv("TEMPEST_UDP_PORT", UDP_PORT))
+    default_udp_workers = int(os.getenv("TEMPEST_UDP_WORKERS", "1"))
     default_debug = env_bool("TEMPEST_DEBUG")
     default_publish_interval = int(os.getenv("TEMPEST_PUBLISH_INTERVAL", "60"))
     default_no_firewall = env_bool("TEMPEST_NO_FIREWALL")
+    default_skip_unchanged = env_bool("TEMPEST_SKIP_UNCHANGED")
+    default_resync_intervals = int(os.getenv("TEMPEST_RESYNC_INTERVALS", "10"))
     
     parser = argparse.ArgumentParser(
         description="Tempest Weather Station Waggle Plugin - publishes Tempest data to Waggle stream",
         epilog="All arguments can be set via environment variables: TEMPEST_PROTOCOL, TEMPEST_TCP_PORT, "
-               "TEMPEST_UDP_PORT, TEMPEST_DEBUG, TEMPEST_PUBLISH_INTERVAL, TEMPEST_NO_FIREWALL"
+               "TEMPEST_TCP_WORKERS, TEMPEST_UDP_PORT, TEMPEST_UDP_WORKERS, TEMPEST_DEBUG, TEMPEST_PUBLISH_INTERVAL, TEMPEST_NO_FIREWALL, "
+               "TEMPEST_SKIP_UNCHANGED, TEMPEST_RESYNC_INTERVALS"
     )
     parser.add_argument(
         "--protocol",
@@ -416,12 +1045,25 @@ def parse_args():
         default=default_tcp_port,
         help=f"TCP port to listen on for length-prefixed messages (default: {TCP_PORT}, env: TEMPEST_TCP_PORT)"
     )
+    parser.add_argument(
+        "--tcp-workers",
+        type=int,
+        default=default_tcp_workers,
+        help="Number of TCP accept threads sharing the port via SO_REUSEPORT (default: 1, env: TEMPEST_TCP_WORKERS)"
+    )
     parser.add_argument(
         "--udp-port", 
         type=int,
         default=default_udp_port, 
         help=f"UDP port to listen for broadcasts (default: {UDP_PORT}, env: TEMPEST_UDP_PORT)"
     )
+    parser.add_argument(
+        "--udp-workers",
+        type=int,
+        default=default_udp_workers,
+        help="Number of UDP listener threads sharing the port via SO_REUSEPORT; "
+             "only useful for unicast senders (default: 1, env: TEMPEST_UDP_WORKERS)"
+    )
     parser.add_argument(
         "--debug", 
         action="store_true", 
@@ -440,13 +1082,24 @@ def parse_args():
         default=default_no_firewall, 
         help="Skip firewall setup warnings (env: TEMPEST_NO_FIREWALL=true)"
     )
+    parser.add_argument(
+        "--skip-unchanged",
+        action="store_true",
+        default=default_skip_unchanged,
+        help="Skip publishing values that are unchanged since their last publish (env: TEMPEST_SKIP_UNCHANGED=true)"
+    )
+    parser.add_argument(
+        "--resync-intervals",
+        type=int,
+        default=default_resync_intervals,
+        help="With --skip-unchanged, republish an unchanged value after this many skips (default: 10, env: TEMPEST_RESYNC_INTERVALS)"
+    )
     return parser.parse_args()
 
 
 # ---------------- Main Function ----------------
 def main():
     """Main function"""
-    global publish_interval
     time.sleep(60)
     args = parse_args()
     
@@ -457,8 +1110,9 @@ def main():
     )
     logger = logging.getLogger(__name__)
     
-    # Set global publish interval from args
-    publish_interval = args.publish_interval
+    # Build the per-type publish gates from the configured interval
+    for msg_type in TEMPEST_PARSERS:
+        publish_gates[msg_type] = make_publish_gate(args.publish_interval)
     
     logger.info("🌤️  Starting Tempest Weather Station Waggle Plugin")
     logger.info("=" * 60)
@@ -469,23 +1123,35 @@ def main():
         env_indicators.append("PROTOCOL")
     if os.getenv("TEMPEST_TCP_PORT"):
         env_indicators.append("TCP_PORT")
+    if os.getenv("TEMPEST_TCP_WORKERS"):
+        env_indicators.append("TCP_WORKERS")
     if os.getenv("TEMPEST_UDP_PORT"):
         env_indicators.append("UDP_PORT")
+    if os.getenv("TEMPEST_UDP_WORKERS"):
+        env_indicators.append("UDP_WORKERS")
     if os.getenv("TEMPEST_PUBLISH_INTERVAL"):
         env_indicators.append("PUBLISH_INTERVAL")
     if os.getenv("TEMPEST_DEBUG"):
         env_indicators.append("DEBUG")
     if os.getenv("TEMPEST_NO_FIREWALL"):
         env_indicators.append("NO_FIREWALL")
+    if os.getenv("TEMPEST_SKIP_UNCHANGED"):
+        env_indicators.append("SKIP_UNCHANGED")
+    if os.getenv("TEMPEST_RESYNC_INTERVALS"):
+        env_indicators.append("RESYNC_INTERVALS")
     
     logger.info(f"Protocol: {args.protocol.upper()}")
     if args.protocol == "tcp":
         logger.info(f"TCP Port: {args.tcp_port}")
+        logger.info(f"TCP Workers: {args.tcp_workers}")
     else:
         logger.info(f"UDP Port: {args.udp_port}")
+        logger.info(f"UDP Workers: {args.udp_workers}")
     logger.info(f"Publish Interval: {args.publish_interval} seconds")
     logger.info(f"Debug Mode: {args.debug}")
     logger.info(f"No Firewall Check: {args.no_firewall}")
+    if args.skip_unchanged:
+        logger.info(f"Skip Unchanged Values: resync every {args.resync_intervals} intervals")
     if env_indicators:
         logger.info(f"📌 Using environment variables: {', '.join(env_indicators)}")
     logger.info("")
@@ -513,169 +1179,74 @@ def main():
                 logger.warning(f"   sudo iptables -I INPUT -p udp --dport {port_to_check} -j ACCEPT")
                 logger.warning("   Or use the firewall-opener container from the main project")
     
+    # SIGTERM (container stop) ends the main loop immediately via this event
+    shutdown = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: shutdown.set())
+    
     # Use Plugin context manager for proper lifecycle management
     # Pass empty config dict for default configuration
     with Plugin() as plugin:
+        # Optionally skip values that have not changed since they were last published
+        value_filter = make_change_filter(args.resync_intervals) if args.skip_unchanged else None
+        
         # Define publishing function as nested function with access to plugin via closure
-        def publish_tempest_data(parsed_data, msg_type, force=False):
-            """Publish Tempest data to Waggle message stream"""
-            global last_publish_times, publish_interval
-            
-            # Check if enough time has elapsed since last publish (unless forced)
-            if not force:
-                current_time = time.time()
-                last_publish = last_publish_times.get(msg_type, 0)
-                time_elapsed = current_time - last_publish
-                
-                if time_elapsed < publish_interval:
-                    logger.debug(f"Skipping {msg_type} publish - only {time_elapsed:.1f}s elapsed (need {publish_interval}s)")
-                    return
-                
-                # Update last publish time
-                last_publish_times[msg_type] = current_time
+        def publish_tempest_data(parsed_data, msg_type):
+            """
+            Publish Tempest data to Waggle message stream
             
+            Throttling happens in the listeners via publish_gates, before the
+            message is parsed, so every call here is published. Failures are
+            reported by the heartbeat thread rather than published here.
+            """
+            global _last_error
             try:
                 if msg_type == "obs_st" and "error" not in parsed_data:
                     # Publish comprehensive weather observations
                     obs = parsed_data
                     timestamp = get_nanosecond_timestamp(obs.get("timestamp"))
+                    published = publish_spec_values(plugin, OBS_ST_PUBLISH_SPEC, obs, timestamp, value_filter)
                     
-                    # Wind data
-                    plugin.publish("tempest.wind.speed.lull", obs["wind"]["lull_kt"], 
-                                 timestamp=timestamp, scope="all",
-                                 meta={"sensor": "tempest-weather-station", "units": "knots", 
-                                       "description": "Tempest wind lull speed", "source": "obs_st", "missing": "-9999.0"})
-                    plugin.publish("tempest.wind.speed.avg", obs["wind"]["avg_kt"], 
-                                 timestamp=timestamp, scope="all",
-                                 meta={"sensor": "tempest-weather-station", "units": "knots", 
-                                       "description": "Tempest average wind speed", "source": "obs_st", "missing": "-9999.0"})
-                    plugin.publish("tempest.wind.speed.gust", obs["wind"]["gust_kt"], 
-                                 timestamp=timestamp, scope="all",
-                                 meta={"sensor": "tempest-weather-station", "units": "knots", 
-                                       "description": "Tempest wind gust speed", "source": "obs_st", "missing": "-9999.0"})
-                    plugin.publish("tempest.wind.direction", obs["wind"]["direction_deg"], 
-                                 timestamp=timestamp, scope="all",
-                                 meta={"sensor": "tempest-weather-station", "units": "degrees", 
-                                       "description": "Tempest wind direction", "source": "obs_st", "missing": "-9999.0"})
-                    
-                    # Environmental data
-                    plugin.publish("tempest.pressure", obs["pressure"]["hpa"], 
-                                 timestamp=timestamp, scope="all",
-                                 meta={"sensor": "tempest-weather-station", "units": "hPa", 
-                                       "description": "Tempest barometric pressure", "source": "obs_st", "missing": "-9999.0"})
-                    plugin.publish("tempest.temperature", obs["temperature"]["c"], 
-                                 timestamp=timestamp, scope="all",
-                                 meta={"sensor": "tempest-weather-station", "units": "celsius", 
-                                       "description": "Tempest air temperature", "source": "obs_st", "missing": "-9999.0"})
-                    plugin.publish("tempest.humidity", obs["humidity_percent"], 
-                                 timestamp=timestamp, scope="all",
-                                 meta={"sensor": "tempest-weather-station", "units": "percent", 
-                                       "description": "Tempest relative humidity", "source": "obs_st", "missing": "-9999.0"})
-                    
-                    # Light data
-                    plugin.publish("tempest.light.illuminance", obs["light"]["illuminance_lux"], 
-                                 timestamp=timestamp, scope="all",
-                                 meta={"sensor": "tempest-weather-station", "units": "lux", 
-                                       "description": "Tempest illuminance", "source": "obs_st", "missing": "-9999.0"})
-                    plugin.publish("tempest.light.uv_index", obs["light"]["uv_index"], 
-                                 timestamp=timestamp, scope="all",
-                                 meta={"sensor": "tempest-weather-station", "units": "index", 
-                                       "description": "Tempest UV index", "source": "obs_st", "missing": "-9999.0"})
-                    plugin.publish("tempest.light.solar_radiation", obs["light"]["solar_radiation_wm2"], 
-                                 timestamp=timestamp, scope="all",
-                                 meta={"sensor": "tempest-weather-station", "units": "W/m²", 
-                                       "description": "Tempest solar radiation", "source": "obs_st", "missing": "-9999.0"})
-                    
-                    # Precipitation data
-                    plugin.publish("tempest.rain.since_report", obs["rain"]["since_report_mm"], 
-                                 timestamp=timestamp, scope="all",
-                                 meta={"sensor": "tempest-weather-station", "units": "mm", 
-                                       "description": "Tempest rain since report", "source": "obs_st", "missing": "-9999.0"})
-                    plugin.publish("tempest.rain.daily", obs["rain"]["local_day_mm"] or 0, 
-                                 timestamp=timestamp, scope="all",
-                                 meta={"sensor": "tempest-weather-station", "units": "mm", 
-                                       "description": "Tempest daily rainfall", "source": "obs_st", "missing": "-9999.0"})
-                    
-                    # Lightning data
-                    plugin.publish("tempest.lightning.distance", obs["lightning"]["avg_distance_km"], 
-                                 timestamp=timestamp, scope="node",
-                                 meta={"sensor": "tempest-weather-station", "units": "km", 
-                                       "description": "Tempest lightning distance", "source": "obs_st", "missing": "-9999.0"})
-                    plugin.publish("tempest.lightning.count", obs["lightning"]["strike_count"], 
-                                 timestamp=timestamp, scope="all",
-                                 meta={"sensor": "tempest-weather-station", "units": "count", 
-                                       "description": "Tempest lightning strike count", "source": "obs_st", "missing": "-9999.0"})
-                    
-                    # Battery and system data
-                    plugin.publish("tempest.battery", obs["battery_v"], 
-                                 timestamp=timestamp, scope="all",
-                                 meta={"sensor": "tempest-weather-station", "units": "volts", 
-                                       "description": "Tempest battery voltage", "source": "obs_st", "missing": "-9999.0"})
-                    plugin.publish("tempest.report_interval", obs["report_interval_min"], 
-                                 timestamp=timestamp, scope="all",
-                                 meta={"sensor": "tempest-weather-station", "units": "minutes", 
-                                       "description": "Tempest report interval", "source": "obs_st", "missing": "-9999.0"})
-                    
-                    logger.info(f"📡 Published obs_st data: Wind {obs['wind']['avg_kt']:.1f} kt @ {obs['wind']['direction_deg']:.0f}°, Temp {obs['temperature']['c']:.1f}°C, RH {obs['humidity_percent']:.0f}%")
+                    if published:
+                        logger.info(f"📡 Published obs_st data: Wind {obs['wind.avg_kt']:.1f} kt @ {obs['wind.direction_deg']:.0f}°, Temp {obs['temperature.c']:.1f}°C, RH {obs['humidity_percent']:.0f}%")
                     
                 elif msg_type == "rapid_wind" and "error" not in parsed_data:
                     # Publish rapid wind data (most recent wind readings)
-                    wind = parsed_data["wind"]
                     timestamp = get_nanosecond_timestamp(parsed_data.get("timestamp"))
+                    published = publish_spec_values(plugin, RAPID_WIND_PUBLISH_SPEC, parsed_data, timestamp, value_filter)
                     
-                    plugin.publish("tempest.wind.speed.instant", wind["instant_kt"], 
-                                 timestamp=timestamp, scope="node",
-                                 meta={"sensor": "tempest-weather-station", "units": "knots", 
-                                       "description": "Tempest instant wind speed", "source": "rapid_wind", "missing": "-9999.0"})
-                    plugin.publish("tempest.wind.direction.instant", wind["direction_deg"], 
-                                 timestamp=timestamp, scope="node",
-                                 meta={"sensor": "tempest-weather-station", "units": "degrees", 
-                                       "description": "Tempest instant wind direction", "source": "rapid_wind", "missing": "-9999.0"})
-                    
-                    logger.info(f"📡 Published rapid_wind data: {wind['instant_kt']:.1f} kt @ {wind['direction_deg']:.0f}°")
+                    if published:
+                        logger.info(f"📡 Published rapid_wind data: {parsed_data['wind.instant_kt']:.1f} kt @ {parsed_data['wind.direction_deg']:.0f}°")
                     
                 elif msg_type == "hub_status" and "error" not in parsed_data:
                     # Publish hub status data
                     timestamp = get_nanosecond_timestamp(parsed_data.get("timestamp"))
+                    published = publish_spec_values(plugin, HUB_STATUS_PUBLISH_SPEC, parsed_data, timestamp, value_filter)
                     
-                    plugin.publish("tempest.hub.firmware", parsed_data["firmware"] or "unknown", 
-                                 timestamp=timestamp, scope="node",
-                                 meta={"sensor": "tempest-weather-station", "description": "Tempest hub firmware version", 
-                                       "source": "hub_status", "missing": "unknown"})
-                    plugin.publish("tempest.hub.uptime", parsed_data["uptime_s"] or 0, 
-                                 timestamp=timestamp, scope="node",
-                                 meta={"sensor": "tempest-weather-station", "units": "seconds", 
-                                       "description": "Tempest hub uptime", "source": "hub_status", "missing": "-9999.0"})
-                    plugin.publish("tempest.hub.rssi", parsed_data["rssi"] or 0, 
-                                 timestamp=timestamp, scope="all",
-                                 meta={"sensor": "tempest-weather-station", "units": "dBm", 
-                                       "description": "Tempest hub signal strength", "source": "hub_status", "missing": "-9999.0"})
+                    if published:
+                        logger.info(f"📡 Published hub_status data: firmware={parsed_data['firmware']}, uptime={parsed_data['uptime_s']}s, RSSI={parsed_data['rssi']}dBm")
                     
-                    logger.info(f"📡 Published hub_status data: firmware={parsed_data['firmware']}, uptime={parsed_data['uptime_s']}s, RSSI={parsed_data['rssi']}dBm")
-                    
-                # Always publish a heartbeat/status message
-                status_timestamp = get_nanosecond_timestamp()
-                plugin.publish("tempest.status", 1, 
-                             timestamp=status_timestamp, scope="node",
-                             meta={"sensor": "tempest-weather-station", 
-                                   "description": "Tempest plugin status (1=active, 0=error)", 
-                                   "last_update": str(int(time.time())), "missing": "-9999.0"})
-                
             except Exception as e:
+                # Reported as tempest.status=0 by the next heartbeat
+                _last_error = str(e)
                 logger.error(f"Error publishing Tempest data: {e}")
-                error_timestamp = get_nanosecond_timestamp()
-                plugin.publish("tempest.status", 0, 
-                             timestamp=error_timestamp, scope="node",
-                             meta={"sensor": "tempest-weather-station", 
-                                   "description": "Tempest plugin status (1=active, 0=error)", 
-                                   "error": str(e), "missing": "-9999.0"})
+        
+        # Publishing runs on its own thread so listeners never wait on plugin.publish()
+        publish_queue = queue.Queue(maxsize=PUBLISH_QUEUE_SIZE)
+        publisher_thread = threading.Thread(
+            target=tempest_publisher,
+            args=(publish_queue, publish_tempest_data, logger),
+            daemon=True
+        )
+        publisher_thread.start()
+        
+        enqueue_publish = make_publish_enqueue(publish_queue, logger)
         
         # Start appropriate listener thread based on protocol
         if args.protocol == "tcp":
             logger.info("🌐 Starting Tempest TCP listener thread...")
             listener_thread = threading.Thread(
                 target=tempest_tcp_listener, 
-                args=(logger, publish_tempest_data, args.tcp_port),
+                args=(logger, enqueue_publish, args.tcp_port, args.tcp_workers),
                 daemon=True
             )
             wait_msg = "⏳ Waiting for Tempest TCP connections with length-prefixed messages..."
@@ -683,35 +1254,44 @@ def main():
             logger.info("🌐 Starting Tempest UDP listener thread...")
             listener_thread = threading.Thread(
                 target=tempest_udp_listener, 
-                args=(logger, publish_tempest_data, args.udp_port),
+                args=(logger, enqueue_publish, args.udp_port, args.udp_workers),
                 daemon=True
             )
             wait_msg = "⏳ Waiting for Tempest UDP broadcasts..."
         
         listener_thread.start()
         
+        # The heartbeat is timer driven, independent of message traffic, but
+        # reports an error once the listener thread has exited
+        heartbeat_thread = threading.Thread(
+            target=tempest_heartbeat,
+            args=(plugin, args.publish_interval, logger, shutdown, listener_thread),
+            daemon=True
+        )
+        heartbeat_thread.start()
+        
         # Wait for initial data
         logger.info(wait_msg)
         time.sleep(5)  # Give some time for initial data
         
         # Check if we received any data
-        with tempest_data_lock:
-            if latest_tempest_raw_by_type:
-                logger.info(f"✅ Tempest station detected! Received {len(latest_tempest_raw_by_type)} message types:")
-                for msg_type in latest_tempest_raw_by_type.keys():
-                    logger.info(f"   - {msg_type}")
+        received_types = tempest_last_seen_by_type.copy()
+        if received_types:
+            logger.info(f"✅ Tempest station detected! Received {len(received_types)} message types:")
+            for msg_type in received_types.keys():
+                logger.info(f"   - {msg_type}")
+        else:
+            logger.warning("⚠️  No Tempest data received yet")
+            logger.info("💡 Troubleshooting:")
+            if args.protocol == "tcp":
+                logger.info("   1. Check that Tempest hub is configured to send TCP data")
+                logger.info("   2. Verify TCP connections can be established on the configured port")
+                logger.info(f"   3. Check firewall/router settings for TCP port {args.tcp_port}")
             else:
-                logger.warning("⚠️  No Tempest data received yet")
-                logger.info("💡 Troubleshooting:")
-                if args.protocol == "tcp":
-                    logger.info("   1. Check that Tempest hub is configured to send TCP data")
-                    logger.info("   2. Verify TCP connections can be established on the configured port")
-                    logger.info(f"   3. Check firewall/router settings for TCP port {args.tcp_port}")
-                else:
-                    logger.info("   1. Check that Tempest hub is on the same network")
-                    logger.info("   2. Verify Tempest station is broadcasting (usually enabled by default)")
-                    logger.info(f"   3. Check firewall/router settings for UDP port {args.udp_port}")
-                logger.info("   4. Try running with --no-firewall if you've already configured firewall")
+                logger.info("   1. Check that Tempest hub is on the same network")
+                logger.info("   2. Verify Tempest station is broadcasting (usually enabled by default)")
+                logger.info(f"   3. Check firewall/router settings for UDP port {args.udp_port}")
+            logger.info("   4. Try running with --no-firewall if you've already configured firewall")
         
         logger.info("")
         logger.info("📡 Tempest plugin is running and publishing data to Waggle stream")
@@ -720,16 +1300,15 @@ def main():
         
         try:
             # Main loop - just keep the plugin running
-            # The listener thread handles all data processing and publishing
-            while True:
-                time.sleep(60)  # Check every minute
-                
-                # Periodic status update
-                with tempest_data_lock:
-                    if latest_tempest_raw_by_type:
-                        logger.info(f"📊 Status: Active, {len(latest_tempest_raw_by_type)} message types received")
-                    else:
-                        logger.warning("📊 Status: No data received from Tempest station")
+            # The listener and publisher threads handle all data processing and publishing
+            while not shutdown.wait(60):  # Check every minute
+                # Periodic status update (len() of a dict is atomic, no snapshot needed)
+                if tempest_last_seen_by_type:
+                    logger.info(f"📊 Status: Active, {len(tempest_last_seen_by_type)} message types received")
+                else:
+                    logger.warning("📊 Status: No data received from Tempest station")
+            
+            logger.info("🛑 Tempest plugin stopped by SIGTERM")
                         
         except KeyboardInterrupt:
             logger.info("🛑 Tempest plugin stopped by user")
@@ -739,12 +1318,14 @@ def main():
         finally:
             # Cleanup
             logger.info("🧹 Cleaning up Tempest plugin...")
+            # Stop the heartbeat and let any beat in progress finish, so no
+            # status 1 can follow the final status
+            shutdown.set()
+            heartbeat_thread.join(timeout=HEARTBEAT_JOIN_TIMEOUT)
             shutdown_timestamp = get_nanosecond_timestamp()
             plugin.publish("tempest.status", 0, 
                          timestamp=shutdown_timestamp, scope="node",
-                         meta={"sensor": "tempest-weather-station", 
-                               "description": "Tempest plugin status (1=active, 0=error)", 
-                               "state": "shutdown", "missing": "-9999.0"})
+                         meta=STATUS_SHUTDOWN_META)
 
 
 if __name__ == "__main__":